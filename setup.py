@@ -6,6 +6,9 @@ from setuptools import setup, find_namespace_packages
 INSTALL_REQUIRES = [
     'aiohttp>=3.5,<4', 'async_timeout', 'yarl'
 ]
+ARROW_REQUIRES = [
+    'pyarrow',
+]
 TEST_REQUIRES = [
     # testing and coverage
     'pytest<5.3', 'pytest-cov',
@@ -35,6 +38,7 @@ setup(
     packages=find_namespace_packages(where='src'),
     install_requires=INSTALL_REQUIRES,
     extras_require={
-        'test': TEST_REQUIRES + INSTALL_REQUIRES,
+        'arrow': ARROW_REQUIRES,
+        'test': TEST_REQUIRES + INSTALL_REQUIRES + ARROW_REQUIRES,
     },
 )
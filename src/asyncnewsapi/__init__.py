@@ -1,5 +1,6 @@
 from asyncnewsapi.session import Session
+from asyncnewsapi.sink import ArrowSink, JsonlSink, ParquetSink
 from asyncnewsapi.stream import Stream
 
 
-__all__ = ['Session', 'Stream', 'auth']
+__all__ = ['Session', 'Stream', 'JsonlSink', 'ArrowSink', 'ParquetSink', 'auth']
@@ -0,0 +1,257 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import json
+import logging
+import re
+
+
+class Sink(ABC):
+    '''
+    Base class for the export sinks. Articles are buffered in memory and handed over to the underlying file in
+    batches of batch_size, rotating to a new file every rows_per_file articles.
+
+    Parameters:
+        (str) path - Path of the output file. When rotating, it should contain a format field (e.g. 'archive-{:05d}')
+                     that is filled in with the index of the file, starting at 0.
+
+    Optional parameters:
+        (int) batch_size - The number of articles to buffer before writing them out. 1000 is the default.
+
+        (int) rows_per_file - The number of articles after which a new file is started. Default: no rotation.
+    '''
+
+    def __init__(self, path, batch_size=1000, rows_per_file=None):
+        batch_size = int(batch_size)
+        if batch_size <= 0:
+            raise ValueError('batch_size should be an int greater than 0')
+        if rows_per_file is not None:
+            rows_per_file = int(rows_per_file)
+            if rows_per_file <= 0:
+                raise ValueError('rows_per_file should be an int greater than 0')
+            try:
+                has_format_field = path.format(0) != path.format(1)
+            except (KeyError, IndexError):
+                has_format_field = False
+            if not has_format_field:
+                raise ValueError('path should contain a format field when rows_per_file is set')
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_per_file = rows_per_file
+        self.paths = []
+        self._buffer = []
+        self._file_index = 0
+        self._file_rows = 0
+        self._is_open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def consume(self, articles):
+        '''
+        Write every article yielded by the async iterator articles (e.g. Session.everything or Stream.everything),
+        returning the number of articles written. Buffered articles are flushed even if iteration is interrupted.
+        '''
+        n = 0
+        try:
+            async for article in articles:
+                self.write(article)
+                n += 1
+        except BaseException:
+            # flush what was buffered, but do not let a flush failure mask the original exception
+            try:
+                self.flush()
+            except Exception:
+                logger = logging.getLogger(__name__)
+                logger.exception('Failed to flush buffered articles')
+            raise
+        self.flush()
+        return n
+
+    def write(self, article):
+        self._buffer.append(article)
+        limit = self.batch_size
+        if self.rows_per_file is not None:
+            # a batch must never straddle two files
+            limit = min(limit, self.rows_per_file - self._file_rows)
+        if len(self._buffer) >= limit:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if not self._is_open:
+            path = self.path if self.rows_per_file is None else self.path.format(self._file_index)
+            logger = logging.getLogger(__name__)
+            logger.debug('Opening sink file: {}'.format(path))
+            self._open(path)
+            self.paths.append(path)
+            self._is_open = True
+        # the buffer is cleared first so that a batch that fails to be written is dropped rather than retried
+        batch, self._buffer = self._buffer, []
+        self._write_batch(batch)
+        self._file_rows += len(batch)
+        if self.rows_per_file is not None and self._file_rows >= self.rows_per_file:
+            self._rotate()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._is_open:
+                self._is_open = False
+                self._close()
+
+    def _rotate(self):
+        self._close()
+        self._is_open = False
+        self._file_index += 1
+        self._file_rows = 0
+
+    @abstractmethod
+    def _open(self, path):
+        pass
+
+    @abstractmethod
+    def _write_batch(self, articles):
+        pass
+
+    @abstractmethod
+    def _close(self):
+        pass
+
+
+class JsonlSink(Sink):
+    '''Writes articles as newline-delimited JSON, one article per line.'''
+
+    def _open(self, path):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write_batch(self, articles):
+        self._file.write(''.join(json.dumps(article, ensure_ascii=False) + '\n' for article in articles))
+
+    def _close(self):
+        self._file.close()
+
+
+# columns of the article schema, source is flattened into source.id and source.name
+ARTICLE_COLUMNS = ['source.id', 'source.name', 'author', 'title', 'description', 'url', 'urlToImage', 'publishedAt', 'content']
+
+
+def parse_published_at(value):
+    '''
+    Parse a NewsAPI publishedAt value (e.g. '2019-03-12T22:00:07Z') into an UTC datetime.
+    Returns None for missing or unparseable values.
+    '''
+    if not value:
+        return None
+    try:
+        value = str(value)
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        # fromisoformat only accepts 3 or 6 fractional digits before python 3.11, pad or truncate to 6
+        value = re.sub(r'\.(\d+)', lambda m: '.' + (m.group(1) + '000000')[:6], value, count=1)
+        published_at = datetime.fromisoformat(value)
+    except ValueError:
+        logger = logging.getLogger(__name__)
+        logger.debug('Could not parse publishedAt value: {}'.format(value))
+        return None
+    if published_at.tzinfo is None:
+        return published_at.replace(tzinfo=timezone.utc)
+    return published_at.astimezone(timezone.utc)
+
+
+def article_columns(articles):
+    '''
+    Transpose a list of article dicts into a dict of columns, following ARTICLE_COLUMNS.
+    Values other than publishedAt are converted to str, so a field with an unexpected type does not fail the batch.
+    '''
+    columns = {name: [] for name in ARTICLE_COLUMNS}
+    for article in articles:
+        source = article.get('source')
+        if not isinstance(source, dict):
+            source = {}
+        columns['source.id'].append(source.get('id'))
+        columns['source.name'].append(source.get('name'))
+        for name in ARTICLE_COLUMNS[2:]:
+            columns[name].append(article.get(name))
+    for name, values in columns.items():
+        if name == 'publishedAt':
+            columns[name] = [parse_published_at(v) for v in values]
+        else:
+            columns[name] = [v if v is None or isinstance(v, str) else str(v) for v in values]
+    return columns
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('pyarrow is required for the Arrow/Parquet sinks, install it with: pip install "asyncnewsapi[arrow]"')
+    return pyarrow
+
+
+def article_schema():
+    '''The pyarrow schema used by ArrowSink and ParquetSink.'''
+    pa = _import_pyarrow()
+    return pa.schema([(name, pa.timestamp('ms', tz='UTC') if name == 'publishedAt' else pa.string())
+                      for name in ARTICLE_COLUMNS])
+
+
+class _ArrowSinkBase(Sink):
+
+    def __init__(self, path, batch_size=10000, rows_per_file=None):
+        self.schema = article_schema()
+        super().__init__(path, batch_size=batch_size, rows_per_file=rows_per_file)
+
+    def _write_batch(self, articles):
+        pa = _import_pyarrow()
+        columns = article_columns(articles)
+        table = pa.Table.from_arrays([pa.array(columns[field.name], type=field.type) for field in self.schema],
+                                     schema=self.schema)
+        self._write_table(table)
+
+    def _close(self):
+        self._writer.close()
+
+    @abstractmethod
+    def _write_table(self, table):
+        pass
+
+
+class ArrowSink(_ArrowSinkBase):
+    '''
+    Writes articles to an Arrow IPC file with the article schema, each batch being written as a record batch.
+    See Sink for the parameters. batch_size defaults to 10000.
+    '''
+
+    def _open(self, path):
+        pa = _import_pyarrow()
+        self._writer = pa.ipc.new_file(path, self.schema)
+
+    def _write_table(self, table):
+        self._writer.write_table(table)
+
+
+class ParquetSink(_ArrowSinkBase):
+    '''
+    Writes articles to a Parquet file with the article schema, each batch being written as a row group.
+    See Sink for the parameters. batch_size defaults to 10000.
+
+    Optional parameters:
+        (str) compression - Parquet compression codec. 'snappy' is the default.
+    '''
+
+    def __init__(self, path, batch_size=10000, rows_per_file=None, compression='snappy'):
+        self.compression = compression
+        super().__init__(path, batch_size=batch_size, rows_per_file=rows_per_file)
+
+    def _open(self, path):
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+        self._writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+
+    def _write_table(self, table):
+        self._writer.write_table(table, row_group_size=len(table))
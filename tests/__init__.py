@@ -1,8 +1,11 @@
 import asyncio
+import functools
 
 
 # async test decorator - https://stackoverflow.com/a/46324983
 def async_test(coro):
+    # functools.wraps exposes the coroutine signature so that pytest can inject fixtures
+    @functools.wraps(coro)
     def wrapper(*args, **kwargs):
         asyncio.run(coro(*args, **kwargs))
     return wrapper
@@ -0,0 +1,202 @@
+import asyncio
+from datetime import datetime, timezone
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from asyncnewsapi import ArrowSink, JsonlSink, ParquetSink
+from asyncnewsapi.sink import article_columns, parse_published_at, Sink
+from tests import async_test
+
+
+PUBLISHED_AT = datetime(2019, 3, 12, 22, 0, 7, tzinfo=timezone.utc)
+
+
+def make_article(i):
+    return {'source': {'id': None, 'name': 'Source {}'.format(i)}, 'author': 'Author', 'title': 'Title {}'.format(i),
+            'description': None, 'url': 'https://example.com/{}'.format(i), 'urlToImage': None,
+            'publishedAt': '2019-03-12T22:00:07Z', 'content': None}
+
+
+async def articles(n):
+    for i in range(n):
+        yield make_article(i)
+
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+
+async def endless_articles(n):
+    '''Yields n articles and then waits forever, like Stream does between requests.'''
+    for i in range(n):
+        yield make_article(i)
+    await asyncio.sleep(3600)
+
+
+async def failing_articles(items):
+    for item in items:
+        yield item
+    raise RuntimeError('iterator failed')
+
+
+class TestParsePublishedAt:
+
+    def test_utc(self):
+        assert parse_published_at('2019-03-12T22:00:07Z') == PUBLISHED_AT
+
+    def test_fractional_digits(self):
+        assert parse_published_at('2019-03-12T22:00:07.1234567Z') == PUBLISHED_AT.replace(microsecond=123456)
+        assert parse_published_at('2019-03-12T22:00:07.1Z') == PUBLISHED_AT.replace(microsecond=100000)
+
+    def test_offset_is_kept(self):
+        assert parse_published_at('2019-03-13T00:00:07.1234567+02:00') == PUBLISHED_AT.replace(microsecond=123456)
+
+    def test_missing(self):
+        assert parse_published_at(None) is None
+
+    def test_unparseable(self):
+        assert parse_published_at('garbage') is None
+
+
+class TestArticleColumns:
+
+    def test_columns(self):
+        columns = article_columns([make_article(0), {'title': 'No source'}])
+        assert columns['source.name'] == ['Source 0', None]
+        assert columns['title'] == ['Title 0', 'No source']
+        assert columns['publishedAt'] == [PUBLISHED_AT, None]
+
+    def test_values_converted_to_str(self):
+        columns = article_columns([{'author': ['x'], 'source': 'not a dict'}])
+        assert columns['author'] == ["['x']"]
+        assert columns['source.name'] == [None]
+
+
+class TestSink:
+
+    def test_abstract(self, tmp_path):
+        with pytest.raises(TypeError):
+            Sink(str(tmp_path / 'archive'))
+
+    def test_batch_size_positive(self, tmp_path):
+        with pytest.raises(ValueError):
+            JsonlSink(str(tmp_path / 'archive.jsonl'), batch_size=0)
+
+    def test_rotation_requires_format_field(self, tmp_path):
+        with pytest.raises(ValueError):
+            JsonlSink(str(tmp_path / 'archive.jsonl'), rows_per_file=4)
+
+    def test_rotation_requires_positional_format_field(self, tmp_path):
+        with pytest.raises(ValueError):
+            JsonlSink(str(tmp_path / 'archive-{name}.jsonl'), rows_per_file=4)
+        with pytest.raises(ValueError):
+            JsonlSink(str(tmp_path / 'archive-{0}{1}.jsonl'), rows_per_file=4)
+
+    @async_test
+    async def test_cancellation_flushes_buffer(self, tmp_path):
+        path = str(tmp_path / 'archive.jsonl')
+        with JsonlSink(path, batch_size=100) as sink:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(sink.consume(endless_articles(5)), 0.1)
+        with open(path) as f:
+            assert len(f.readlines()) == 5
+
+    @async_test
+    async def test_iterator_error_not_masked_by_flush(self, tmp_path):
+        with JsonlSink(str(tmp_path / 'archive.jsonl')) as sink:
+            # the buffered object cannot be serialized, the iterator error should still propagate
+            with pytest.raises(RuntimeError):
+                await sink.consume(failing_articles([object()]))
+
+
+class TestJsonlSink:
+
+    @async_test
+    async def test_consume(self, tmp_path):
+        path = str(tmp_path / 'archive.jsonl')
+        with JsonlSink(path, batch_size=3) as sink:
+            assert await sink.consume(articles(10)) == 10
+        with open(path) as f:
+            assert [json.loads(line) for line in f] == [make_article(i) for i in range(10)]
+
+    @async_test
+    async def test_rotation(self, tmp_path):
+        with JsonlSink(str(tmp_path / 'archive-{}.jsonl'), batch_size=3, rows_per_file=4) as sink:
+            await sink.consume(articles(10))
+        assert sink.paths == [str(tmp_path / 'archive-{}.jsonl'.format(i)) for i in range(3)]
+        rows = []
+        for path in sink.paths:
+            with open(path) as f:
+                rows.append(len(f.readlines()))
+        assert rows == [4, 4, 2]
+
+
+class TestArrowSink:
+
+    @async_test
+    async def test_consume(self, tmp_path):
+        path = str(tmp_path / 'archive.arrow')
+        with ArrowSink(path, batch_size=3) as sink:
+            await sink.consume(articles(10))
+        reader = pa.ipc.open_file(path)
+        assert reader.num_record_batches == 4
+        table = reader.read_all()
+        assert table.schema == sink.schema
+        assert table.column('source.name').to_pylist() == ['Source {}'.format(i) for i in range(10)]
+        assert table.column('publishedAt')[0].as_py() == PUBLISHED_AT
+
+    @async_test
+    async def test_rotation(self, tmp_path):
+        with ArrowSink(str(tmp_path / 'archive-{}.arrow'), batch_size=3, rows_per_file=4) as sink:
+            await sink.consume(articles(10))
+        readers = [pa.ipc.open_file(path) for path in sink.paths]
+        assert [reader.read_all().num_rows for reader in readers] == [4, 4, 2]
+        for reader in readers:
+            assert all(reader.get_batch(i).num_rows <= 4 for i in range(reader.num_record_batches))
+
+
+class TestParquetSink:
+
+    @async_test
+    async def test_consume(self, tmp_path):
+        path = str(tmp_path / 'archive.parquet')
+        with ParquetSink(path, batch_size=3) as sink:
+            await sink.consume(articles(10))
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 4
+        table = parquet_file.read()
+        assert table.schema == sink.schema
+        assert table.column('source.name').to_pylist() == ['Source {}'.format(i) for i in range(10)]
+        assert table.column('publishedAt')[0].as_py() == PUBLISHED_AT
+
+    @async_test
+    async def test_rotation(self, tmp_path):
+        with ParquetSink(str(tmp_path / 'archive-{}.parquet'), batch_size=3, rows_per_file=4) as sink:
+            await sink.consume(articles(10))
+        metadata = [pq.ParquetFile(path).metadata for path in sink.paths]
+        assert [m.num_rows for m in metadata] == [4, 4, 2]
+        for m in metadata:
+            assert all(m.row_group(i).num_rows <= 4 for i in range(m.num_row_groups))
+
+    @async_test
+    async def test_bad_values(self, tmp_path):
+        path = str(tmp_path / 'archive.parquet')
+        article = dict(make_article(0), author=['x'], publishedAt='garbage')
+        with ParquetSink(path) as sink:
+            await sink.consume(iterate([article]))
+        table = pq.read_table(path)
+        assert table.column('author').to_pylist() == ["['x']"]
+        assert table.column('publishedAt').to_pylist() == [None]
+
+    @async_test
+    async def test_write_error_keeps_file_readable(self, tmp_path):
+        path = str(tmp_path / 'archive.parquet')
+        with pytest.raises(AttributeError):
+            with ParquetSink(path, batch_size=3) as sink:
+                # the fourth item is not an article and fails the second batch
+                await sink.consume(iterate([make_article(i) for i in range(3)] + [None] + [make_article(i) for i in range(2)]))
+        assert pq.read_table(path).num_rows == 3